@@ -1,7 +1,7 @@
 """
 plot_model.py
 -------------
-Provides a helper function to fit a simple 3rd-degree polynomial regression
+Provides helper functions to fit a simple 3rd-degree polynomial regression
 on historical stock closing prices and visualize:
 
 - Actual historical prices
@@ -10,13 +10,149 @@ on historical stock closing prices and visualize:
 
 This is intended as an educational/demo tool and not as a serious
 financial forecasting model.
+
+Several symbols can be fitted together with `plot_models`: symbols with the
+same number of trading days share one design matrix and are solved in a
+single call.
 """
 
-import matplotlib.pyplot as plt
+import os
+
 import numpy as np
-import pandas as pd
-from sklearn.linear_model import LinearRegression
-from sklearn.preprocessing import PolynomialFeatures
+
+
+def design_matrix(n, days_ahead):
+    """
+    Build the cubic design matrix for `n` historical and `days_ahead`
+    future time points.
+
+    With fewer than 4 historical points a cubic is underdetermined, so the
+    degree is capped at `n - 1`: a single point gives a constant and two
+    points give a straight line.
+
+    Parameters
+    ----------
+    n : int
+        Number of historical data points.
+    days_ahead : int
+        Number of future points to extrapolate to.
+
+    Returns
+    -------
+    numpy.ndarray
+        float32 array of shape (n + days_ahead, min(n, 4)) with columns
+        [1, x, x^2, x^3] (up to the capped degree), where x is time mapped so
+        that the historical period spans [-1, 1]. The first `n` rows cover
+        the historical period, the remaining rows the future points.
+    """
+    # Consecutive integer time index covering the historical period
+    # (0, 1, ..., n-1) followed by the `days_ahead` future points
+    t_all = np.arange(n + days_ahead, dtype=np.float64)
+
+    # Map the historical period onto [-1, 1] (as numpy's Polynomial.fit does)
+    # so the powers stay well conditioned; this keeps single precision
+    # accurate enough for the fit. A single historical point has no extent
+    # to map, so fall back to a unit-length domain instead of dividing by zero
+    x = np.polynomial.polyutils.mapdomain(t_all, [0, max(n - 1, 1)], [-1, 1])
+
+    # Cap the degree so short histories still give a determined fit
+    degree = min(3, n - 1)
+
+    return np.polynomial.polynomial.polyvander(x, degree).astype(np.float32)
+
+
+def fit_poly(V, y):
+    """
+    Least-squares fit of polynomial coefficients for a given design matrix.
+
+    Parameters
+    ----------
+    V : numpy.ndarray
+        Design matrix of shape (n, k), e.g. the historical rows returned
+        by `design_matrix`.
+    y : numpy.ndarray
+        Target values of shape (n,), or shape (n, m) to fit `m` series
+        against the same design matrix at once.
+
+    Returns
+    -------
+    numpy.ndarray
+        Coefficients of shape (k,) or (k, m), ordered lowest power first.
+    """
+    # Solve directly on V rather than via the normal equations, which would
+    # square its condition number; all columns of `y` share one factorization
+    coeffs, *_ = np.linalg.lstsq(V, y, rcond=None)
+    return coeffs
+
+
+def plot_models(frames, days_ahead):
+    """
+    Plot historical closing prices, polynomial trends, and extrapolated
+    predictions for several stocks.
+
+    Symbols with the same number of trading days are fitted together: the
+    design matrix is built once and all their price series are solved in a
+    single call.
+
+    Parameters
+    ----------
+    frames : dict of str to pandas.DataFrame
+        Mapping of stock ticker symbol to its data, in the format accepted
+        by `plot_model`. Plots are produced in the mapping's order.
+    days_ahead : int
+        Number of future calendar days to forecast and plot.
+    """
+    # --- Ensure data is sorted and extract NumPy arrays ---
+
+    series = {}
+    for symbol, df in frames.items():
+        # Sort by date to guarantee time order (important if the saved data
+        # was shuffled); saved data is normally already chronological, so
+        # skip the copy
+        if not df["Date"].is_monotonic_increasing:
+            df = df.sort_values("Date", ignore_index=True)
+
+        # Drop any timezone (keeping local wall time) so the dates convert
+        # to datetime64 rather than an object array of Timestamps
+        dates = df["Date"]
+        if dates.dt.tz is not None:
+            dates = dates.dt.tz_localize(None)
+
+        # Work with plain NumPy arrays from here on; passing them to
+        # matplotlib also skips its pandas unit-conversion path
+        series[symbol] = (dates.to_numpy(), df["Close"].to_numpy())
+
+    # --- Fit polynomial regression models (degree = 3) on historical data ---
+
+    # Group symbols by history length so each group can share a design matrix
+    groups = {}
+    for symbol, (_, close) in series.items():
+        groups.setdefault(len(close), []).append(symbol)
+
+    predictions = {}
+    for n, symbols in groups.items():
+        # Build the design matrix once for all time points, then split it
+        # into the historical and future parts
+        V = design_matrix(n, days_ahead)
+        V_hist, V_fut = V[:n], V[n:]
+
+        # Dependent variables: one column of closing prices per symbol,
+        # in single precision
+        Y = np.column_stack([series[symbol][1] for symbol in symbols])
+        coeffs = fit_poly(V_hist, Y.astype(np.float32))
+
+        # Model predictions over the historical period and future points
+        Y_pred = V_hist @ coeffs
+        future_pred = V_fut @ coeffs
+
+        for i, symbol in enumerate(symbols):
+            predictions[symbol] = (Y_pred[:, i], future_pred[:, i])
+
+    # --- Plot each symbol ---
+
+    for symbol, (dates, close) in series.items():
+        y_pred, future_pred = predictions[symbol]
+        _draw_plot(symbol, days_ahead, dates, close, y_pred, future_pred)
 
 
 def plot_model(df, symbol, days_ahead):
@@ -37,61 +173,70 @@ def plot_model(df, symbol, days_ahead):
 
     Notes
     -----
+    If the `HEADLESS` environment variable is set to "1", "true" or "yes"
+    (case-insensitive), the non-interactive "Agg" backend is used and the
+    figure is saved to `<symbol>.png` in the current directory instead of
+    being shown in a window. Any other value (e.g. "0" or "false") keeps the
+    interactive behaviour.
+
     This function uses a 3rd-degree polynomial regression purely for
     demonstration/visualization. It is not suitable for real trading
     decisions or robust forecasting.
     """
-    # --- Ensure data is sorted and indexed correctly ---
-
-    # Sort by date to guarantee time order (important if CSV was shuffled)
-    df = df.sort_values("Date").reset_index(drop=True)
-
-    # Create a consecutive integer time index (0, 1, 2, ..., n-1)
-    # for use as the regression input feature
-    t = np.arange(len(df))
-
-    # --- Fit polynomial regression model (degree = 3) on historical data ---
+    plot_models({symbol: df}, days_ahead)
 
-    poly = PolynomialFeatures(degree=3)
-    X_poly = poly.fit_transform(t.reshape(-1, 1))
 
-    # Dependent variable: closing prices as a NumPy array
-    y = df["Close"].to_numpy()
-
-    model = LinearRegression()
-    model.fit(X_poly, y)
+def _draw_plot(symbol, days_ahead, dates, close, y_pred, future_pred):
+    """
+    Draw (and show or save) the plot for a single symbol.
 
-    # Model predictions over the historical period
-    y_pred = model.predict(X_poly)
+    Parameters
+    ----------
+    symbol : str
+        Stock ticker symbol used in the plot title and file name.
+    days_ahead : int
+        Number of future calendar days that were predicted.
+    dates : numpy.ndarray
+        Historical trading dates (datetime64).
+    close : numpy.ndarray
+        Historical closing prices.
+    y_pred : numpy.ndarray
+        Fitted trend over the historical period.
+    future_pred : numpy.ndarray
+        Extrapolated predictions for the next `days_ahead` days.
+    """
+    # Import matplotlib lazily: it is slow to import and only needed once a
+    # plot is actually produced
+    import matplotlib
 
-    # --- Build future time points and generate extrapolated predictions ---
+    # In headless mode use the non-interactive Agg backend, which skips GUI
+    # backend probing; otherwise keep matplotlib's default (or MPL_BACKEND)
+    headless = os.environ.get("HEADLESS", "").lower() in {"1", "true", "yes"}
+    if headless:
+        matplotlib.use("Agg")
 
-    last_t = t[-1]
-    # Future integer time indices for the next `days_ahead` days
-    future_t = np.arange(last_t + 1, last_t + 1 + days_ahead).reshape(-1, 1)
-    future_X_poly = poly.transform(future_t)
-    future_pred = model.predict(future_X_poly)
+    import matplotlib.pyplot as plt
+    from matplotlib.ticker import FormatStrFormatter
 
     # Build a continuous range of future calendar dates matching `days_ahead`
-    last_date = df["Date"].iloc[-1]
-    future_dates = pd.date_range(
-        start=last_date + pd.Timedelta(days=1),
-        periods=days_ahead,
-        freq="D",
+    last_date = dates[-1]
+    future_dates = np.datetime64(last_date, "D") + np.arange(
+        1, days_ahead + 1, dtype="timedelta64[D]"
     )
 
     # --- Plot historical data, trend, and future predictions ---
 
-    plt.figure(figsize=(10, 5))
+    # Create the figure and its axes once and draw everything on them
+    fig, ax = plt.subplots(figsize=(10, 5))
 
     # Actual closing prices
-    plt.plot(df["Date"], df["Close"], label="Actual Price")
+    ax.plot(dates, close, label="Actual Price")
 
     # Polynomial regression trend over historical data
-    plt.plot(df["Date"], y_pred, label="Trend", linewidth=2)
+    ax.plot(dates, y_pred, label="Trend", linewidth=2)
 
     # Extrapolated future predictions (simple and illustrative only)
-    plt.plot(
+    ax.plot(
         future_dates,
         future_pred,
         label=f"Future {days_ahead}d Prediction",
@@ -100,11 +245,22 @@ def plot_model(df, symbol, days_ahead):
     )
 
     # Labels and title for readability
-    plt.xlabel("Date")
-    plt.ylabel("Close Price")
-    plt.title(f"{symbol} Closing Price Over Time")
-
-    plt.legend()
-    plt.grid(True)
-    plt.tight_layout()
-    plt.show()
\ No newline at end of file
+    ax.set_xlabel("Date")
+    ax.set_ylabel("Close Price")
+    ax.set_title(f"{symbol} Closing Price Over Time")
+
+    # Show prices with 2 decimals on the axis (display only; the fit uses
+    # the unrounded values)
+    ax.yaxis.set_major_formatter(FormatStrFormatter("%.2f"))
+
+    ax.legend()
+    ax.grid(True)
+    fig.tight_layout()
+
+    if headless:
+        filename = f"{symbol}.png"
+        fig.savefig(filename, dpi=100)
+        plt.close(fig)
+        print(f"Saved plot to {filename}.")
+    else:
+        plt.show()
\ No newline at end of file
@@ -4,12 +4,14 @@ read_and_plot.py
 Command-line script that:
 
 1. Prompts the user for:
-   - A stock ticker symbol (e.g., AAPL)
+   - One or more comma-separated stock ticker symbols (e.g., AAPL,MSFT)
    - A number of future days to predict
-2. Downloads 1 year of daily OHLC data for that symbol using yfinance
-3. Saves the raw data to a CSV file under the `data/` folder
-4. Reads and cleans the saved data
-5. Calls `plot_model` to visualize the historical prices and a simple
+2. Downloads 1 year of daily OHLC data for each symbol using yfinance,
+   in a single batched request (recently saved data is reused)
+3. Cleans the data in memory
+4. Saves the raw data to a Parquet file under the `data/` folder, in
+   parallel with the cleaning, for reuse by later runs
+5. Calls `plot_models` to visualize the historical prices and a simple
    polynomial regression-based future projection.
 
 This script is designed as a small, self-contained demo project for
@@ -17,19 +19,33 @@ learning data handling, basic modeling, and plotting in Python.
 """
 
 import os
+import tempfile
+import threading
+import time
 
-import pandas as pd
-import yfinance as yf
+# The regression fits are tiny, so multi-threaded BLAS only adds thread
+# start-up overhead (and oversubscribes the CPU when several symbols are
+# processed). Default to a single BLAS thread; this must happen before
+# NumPy is imported. Existing user settings are left untouched.
+os.environ.setdefault("OPENBLAS_NUM_THREADS", "1")
+os.environ.setdefault("MKL_NUM_THREADS", "1")
+os.environ.setdefault("OMP_NUM_THREADS", "1")
 
-from plot_model import plot_model
+import pandas as pd  # noqa: E402
+import yfinance as yf  # noqa: E402
 
-# Folder where all CSV data files will be stored
+from plot_model import plot_models  # noqa: E402
+
+# Folder where all Parquet data files will be stored
 FOLDER_NAME = "data"
 
+# Maximum age (in seconds) of a saved file before it is downloaded again
+CACHE_MAX_AGE = 6 * 3600
+
 
 def get_filepath(symbol):
     """
-    Build the full CSV file path for a given stock symbol.
+    Build the full Parquet file path for a given stock symbol.
 
     Parameters
     ----------
@@ -39,37 +55,147 @@ def get_filepath(symbol):
     Returns
     -------
     str
-        Absolute or relative path to the CSV file within the data folder.
+        Absolute or relative path to the Parquet file within the data folder.
+    """
+    return os.path.join(FOLDER_NAME, f"{symbol}.parquet")
+
+
+def save_data(df, filepath):
     """
-    return os.path.join(FOLDER_NAME, f"{symbol}.csv")
+    Save downloaded stock price data as Parquet for later reuse.
+
+    Intended to run in a separate thread, so errors are reported rather
+    than raised. The data is written to a temporary file first and then
+    moved into place, so an interrupted write never leaves a truncated file
+    behind.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Raw downloaded data with 'Date' as a regular column.
+    filepath : str
+        Destination path of the Parquet file.
+    """
+    tmp_path = None
+    try:
+        # Ensure the data folder exists; create it if missing
+        folder = os.path.dirname(filepath)
+        os.makedirs(folder, exist_ok=True)
+
+        # Write to a temporary file in the same folder (so the final rename
+        # stays on one filesystem); column dtypes are preserved on disk, so no
+        # re-parsing is needed on read
+        fd, tmp_path = tempfile.mkstemp(dir=folder, suffix=".tmp")
+        os.close(fd)
+        df.to_parquet(tmp_path, index=False)
+
+        # Atomically replace any previous file
+        os.replace(tmp_path, filepath)
+
+        # Messages include their newline so output from concurrent saves is
+        # written in one piece and can't be glued together
+        print(f"Successfully saved data to {filepath}.\n", end="")
+
+    except Exception as e:
+        # Any unexpected exception (I/O, permissions, etc.)
+        print(f"Error saving data to {filepath}: {e}\n", end="")
+
+        # Don't leave a partial temporary file behind
+        if tmp_path is not None and os.path.exists(tmp_path):
+            os.remove(tmp_path)
 
 
-def download_and_save_data(symbol):
+def read_cached_data(symbol):
     """
-    Download 1 year of daily stock price data and save it as CSV.
+    Read recently saved stock price data for a symbol, if there is any.
 
     Parameters
     ----------
     symbol : str
-        Stock ticker symbol to download (e.g., "TSLA", "MSFT").
+        Stock ticker symbol (e.g., "AAPL").
 
     Returns
     -------
-    bool
-        True if data is downloaded and saved successfully.
-        False if download fails or returns no data.
+    pandas.DataFrame or None
+        DataFrame with 'Date' and 'Close' columns, or None if no file for
+        the symbol was saved less than `CACHE_MAX_AGE` seconds ago or the
+        file cannot be read.
     """
     filepath = get_filepath(symbol)
 
-    print(f"--- Step 1: Downloading data for {symbol} ---")
+    if (
+        not os.path.exists(filepath)
+        or time.time() - os.path.getmtime(filepath) >= CACHE_MAX_AGE
+    ):
+        return None
+
+    try:
+        # Read only the columns we need; 'Date' and 'Close' keep their
+        # datetime/float dtypes, so no re-parsing is required
+        df = pd.read_parquet(filepath, columns=["Date", "Close"])
+
+    except Exception as e:
+        # A corrupt or unreadable file is treated like a missing one, so the
+        # symbol is downloaded again (and the file overwritten)
+        print(f"Error reading cached data from {filepath}: {e}")
+        return None
+
+    print(f"Using cached data for {symbol} from {filepath}.")
+    return df
+
+
+def download_data(symbols):
+    """
+    Download 1 year of daily stock price data for several symbols.
+
+    All symbols are fetched with a single `yf.download` call, which runs the
+    requests in parallel internally. `yf.download` itself must not be called
+    from several threads at once, since it keeps its results in module-level
+    state.
+
+    Parameters
+    ----------
+    symbols : list of str
+        Stock ticker symbols to download (e.g., ["TSLA", "MSFT"]).
 
-    # Ensure the data folder exists; create it if missing
-    os.makedirs(FOLDER_NAME, exist_ok=True)
-    print(f"Ensured folder '{FOLDER_NAME}' exists.")
+    Returns
+    -------
+    dict of str to pandas.DataFrame
+        Raw downloaded data per symbol, with 'Date' as a regular column.
+        Symbols for which no data was returned are left out.
+    """
+    print(f"--- Step 1: Downloading data for {', '.join(symbols)} ---")
 
     try:
         # Download up to 1 year of daily prices, auto-adjusted for splits/dividends
-        df = yf.download(symbol, period="1y", interval="1d", auto_adjust=True)
+        data = yf.download(
+            symbols,
+            period="1y",
+            interval="1d",
+            auto_adjust=True,
+            group_by="ticker",
+            threads=True,
+        )
+
+    except Exception as e:
+        # Any unexpected exception (network, etc.)
+        print(f"Error downloading {', '.join(symbols)}: {e}")
+        return {}
+
+    frames = {}
+    for symbol in symbols:
+        # Columns are (ticker, field) pairs; older yfinance versions return
+        # plain field columns when a single ticker is requested
+        if not isinstance(data.columns, pd.MultiIndex):
+            df = data
+        elif symbol in data.columns.get_level_values(0):
+            df = data[symbol]
+        else:
+            df = pd.DataFrame()
+
+        # Failed tickers come back as all-NaN columns, and dates on which only
+        # other tickers traded as all-NaN rows
+        df = df.dropna(how="all")
 
         # If no rows were returned, treat it as a failure (bad symbol or network issue)
         if df.empty:
@@ -77,88 +203,122 @@ def download_and_save_data(symbol):
                 f"Error: No data downloaded for {symbol}. "
                 "Check the ticker symbol or your network connection."
             )
-            return False
+            continue
 
         # Move the index (Date) into a regular column
-        df = df.reset_index()
+        frames[symbol] = df.reset_index()
 
-        # Save to CSV for later reuse
-        df.to_csv(filepath, index=False)
-        print(f"Successfully saved data to {filepath}.")
+    return frames
 
-        return True
 
-    except Exception as e:
-        # Any unexpected exception (network, I/O, etc.)
-        print(f"Error downloading {symbol}: {e}")
-        return False
-
-
-def read_and_process_data(symbol):
+def fetch_and_clean(symbols):
     """
-    Read the saved CSV for the given symbol and perform basic cleaning.
+    Fetch 1 year of daily stock price data for several symbols and perform
+    basic cleaning.
+
+    Symbols with a file saved less than `CACHE_MAX_AGE` seconds ago are read
+    from it. The remaining symbols are downloaded together, cleaned in memory
+    and saved as Parquet in separate threads. The function waits for the
+    saves to finish before returning, so their messages don't interleave
+    with later console output.
 
     Parameters
     ----------
-    symbol : str
-        Stock ticker symbol whose CSV file should exist in the data folder.
+    symbols : list of str
+        Stock ticker symbols to fetch (e.g., ["TSLA", "MSFT"]).
 
     Returns
     -------
-    pandas.DataFrame
-        Cleaned DataFrame with:
+    dict of str to pandas.DataFrame
+        Cleaned DataFrame per symbol, in the order of `symbols`, with:
         - 'Date' as datetime
-        - 'Close' as numeric (rounded to 2 decimals)
+        - 'Close' as numeric
         Rows with missing 'Close' values are dropped.
-        An empty DataFrame is returned if the file does not exist.
+        An empty DataFrame is returned for symbols whose download failed
+        or returned no data.
     """
-    filepath = get_filepath(symbol)
+    results = {}
+    to_download = []
+    for symbol in symbols:
+        df = read_cached_data(symbol)
+        if df is None:
+            to_download.append(symbol)
+        else:
+            results[symbol] = df
 
-    print(f"\n--- Step 2: Reading and processing data from {filepath} ---")
+    save_threads = []
+    if to_download:
+        for symbol, df in download_data(to_download).items():
+            # Save for later reuse while the data is cleaned
+            thread = threading.Thread(target=save_data, args=(df, get_filepath(symbol)))
+            thread.start()
+            save_threads.append(thread)
 
-    # If the CSV file isn't found, return an empty DataFrame
-    if not os.path.exists(filepath):
-        print(f"Error: File {filepath} not found. Download data first.")
-        return pd.DataFrame()
+            results[symbol] = df[["Date", "Close"]]
 
-    # Read raw CSV data
-    df = pd.read_csv(filepath)
+    cleaned = {}
+    for symbol in symbols:
+        if symbol not in results:
+            cleaned[symbol] = pd.DataFrame()
+            continue
 
-    # Convert the 'Date' column to datetime for proper time-series operations
-    df["Date"] = pd.to_datetime(df["Date"])
+        # Drop any rows where 'Close' is missing, then reset index
+        df = results[symbol].dropna(subset=["Close"])
+        cleaned[symbol] = df.reset_index(drop=True)
 
-    # Ensure 'Close' is numeric; coerce invalid entries to NaN, then round
-    df["Close"] = pd.to_numeric(df["Close"], errors="coerce").round(2)
+    # Wait for the saves so their messages can't break into the user prompt
+    for thread in save_threads:
+        thread.join()
 
-    # Drop any rows where 'Close' is missing, then reset index
-    df = df.dropna(subset=["Close"]).reset_index(drop=True)
+    return cleaned
 
-    return df
 
+def main(symbols):
+    """
+    Run the fetching, cleaning, and plotting steps for several symbols.
 
-if __name__ == "__main__":
-    # --- Command-line interaction and overall script flow ---
+    Parameters
+    ----------
+    symbols : list of str
+        Stock ticker symbols to process (e.g., ["AAPL", "MSFT"]).
+        Repeated symbols are processed once.
+    """
+    # Ignore repeated symbols, keeping the order they were entered in
+    symbols = list(dict.fromkeys(symbols))
 
-    # Ask user for a stock ticker symbol and normalize to uppercase
-    symbol = input("Enter stock symbol(e.g. AAPL): ").upper()
+    # Step 1: Fetch and clean data for all symbols
+    results = fetch_and_clean(symbols)
 
-    # Step 1: Download and save raw data
-    success = download_and_save_data(symbol)
+    frames = {}
+    for symbol, df in results.items():
+        if df.empty:
+            print(f"Execution halted. Fetching data failed for '{symbol}'.")
+            continue
 
-    if success:
-        # Step 2: Read back the saved CSV and clean it
-        df = read_and_process_data(symbol)
+        print(f"Successfully processed {len(df)} trading days of data for {symbol}.")
+        frames[symbol] = df
 
-        if not df.empty:
-            print(f"Successfully processed {len(df)} trading days of data for {symbol}.")
+    if not frames:
+        return
 
-            # Ask the user how many future days they want to predict
-            # Note: This assumes the user enters a valid integer
-            days_ahead = int(input("Enter number of days to predict(in days): "))
+    # Ask the user how many future days they want to predict
+    # Note: This assumes the user enters a valid integer
+    days_ahead = int(input("Enter number of days to predict(in days): "))
 
-            # Step 3: Plot historical prices and simple future projection
-            plot_model(df, symbol, days_ahead)
-        else:
-            print(f"Execution halted. Data processing failed for '{symbol}'.")
+    # Step 2: Fit all symbols together, then plot historical prices and
+    # simple future projections
+    plot_models(frames, days_ahead)
+
+
+if __name__ == "__main__":
+    # --- Command-line interaction and overall script flow ---
+
+    # Ask user for one or more comma-separated ticker symbols and
+    # normalize them to uppercase
+    raw_symbols = input("Enter stock symbol(s), comma-separated (e.g. AAPL,MSFT): ")
+    symbols = [s.strip().upper() for s in raw_symbols.split(",") if s.strip()]
+
+    if symbols:
+        main(symbols)
     else:
-        print(f"Execution halted. Download failed for '{symbol}'.")
\ No newline at end of file
+        print("Execution halted. No stock symbol entered.")